@@ -1,18 +1,25 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Depends, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 import os
+import asyncio
+import time
 from datetime import datetime, date
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
 from bson import ObjectId
 import base64
 from dotenv import load_dotenv
 import uuid
+import orjson
 
 load_dotenv()
 
-app = FastAPI()
+# orjson serializes the large history/photos lists far faster than stdlib json
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # CORS
 app.add_middleware(
@@ -23,9 +30,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# History/photos responses are large JSON; small ones aren't worth compressing
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # MongoDB Setup
 MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
-client = AsyncIOMotorClient(MONGO_URL)
+client = AsyncIOMotorClient(
+    MONGO_URL,
+    maxPoolSize=20,  # bound pool growth under bursts
+    minPoolSize=5,   # keep warm connections so the first requests don't pay the handshake
+    serverSelectionTimeoutMS=2000,  # fail fast instead of hanging requests for 30s
+    compressors="zlib"  # stdlib-backed; base64 photos still shrink ~25% on the wire
+)
 db = client.hard75_tracker
 
 # --- Models ---
@@ -40,13 +56,14 @@ class Challenge(BaseModel):
 class TaskUpdate(BaseModel):
     task_id: str
     completed: bool
-class PhotoUpload(BaseModel):
-    image_base64: str
+class BatchLog(BaseModel):
+    tasks: Dict[str, bool] = Field(default_factory=dict)
+    image_base64: Optional[str] = None
 
 class DailyLog(BaseModel):
     date: str  # YYYY-MM-DD
     tasks: Dict[str, bool]
-    photo_base64: Optional[str] = None
+    has_photo: bool = False  # image itself lives in the photos collection
     day_number: int
     is_completed: bool = False
 
@@ -57,31 +74,215 @@ class AppState(BaseModel):
 
 # --- Helpers ---
 
-DEFAULT_CHALLENGES = [
+DEFAULT_CHALLENGES = (
     {"id": "diet", "label": "Follow Diet", "sub": "No cheat meals", "icon": "Utensils", "is_active": True},
     {"id": "workout_1", "label": "Workout 1", "sub": "45 mins (Indoor/Outdoor)", "icon": "Dumbbell", "is_active": True},
     {"id": "workout_2", "label": "Workout 2", "sub": "45 mins (Must be different)", "icon": "Dumbbell", "is_active": True},
     {"id": "water", "label": "Drink Water", "sub": "1 Gallon", "icon": "Droplets", "is_active": True},
     {"id": "reading", "label": "Read 10 Pages", "sub": "Non-fiction only", "icon": "BookOpen", "is_active": True},
     {"id": "no_alcohol", "label": "No Alcohol", "sub": "Zero tolerance", "icon": "Ban", "is_active": True},
-]
+)
+
+# Task template used until any challenge exists; built once, copied on use
+_DEFAULT_TASKS = dict.fromkeys((c["id"] for c in DEFAULT_CHALLENGES), False) | {"photo_logged": False}
+
+# Log reads never need the legacy inline image (see migrate_inline_photos)
+LOG_PROJECTION = {"_id": 0, "photo_base64": 0}
+
+# (ordinal, iso string) for the current local day, recomputed only on rollover
+_today_cache = (0, "")
+
+def _cached_today() -> str:
+    global _today_cache
+    today = date.today()
+    ordinal = today.toordinal()
+    if _today_cache[0] != ordinal:
+        _today_cache = (ordinal, today.isoformat())
+    return _today_cache[1]
+
+async def today_dep() -> str:
+    """Resolves today's YYYY-MM-DD string once per request"""
+    # async so FastAPI doesn't hop to the threadpool just to read the clock
+    return _cached_today()
+
+# Challenges change only when the user edits them, so keep them in-process.
+# Writes through this API invalidate immediately; the TTL bounds staleness
+# for writes made by other workers or directly in the database. A stale copy
+# only affects what is shown: the log sync keeps task keys it doesn't know
+# about, and complete_day reads the challenges fresh.
+CHALLENGES_CACHE_TTL = 60  # seconds
+_challenges_cache: Optional[List[Dict[str, Any]]] = None
+_challenges_cached_at = 0.0
+_challenges_version = 0
+_challenges_lock = asyncio.Lock()
+
+async def get_challenges_cached():
+    """Returns all challenges (without _id), served from memory when fresh"""
+    global _challenges_cache, _challenges_cached_at
+    if _challenges_cache is not None and time.monotonic() - _challenges_cached_at < CHALLENGES_CACHE_TTL:
+        return _challenges_cache
+    
+    async with _challenges_lock:
+        # Another request may have refilled the cache while we waited
+        if _challenges_cache is not None and time.monotonic() - _challenges_cached_at < CHALLENGES_CACHE_TTL:
+            return _challenges_cache
+        
+        version = _challenges_version
+        challenges = await db.challenges.find({}, {"_id": 0}).to_list(length=100)
+        # Don't store a result that raced with an invalidation
+        if version == _challenges_version:
+            _challenges_cache = challenges
+            _challenges_cached_at = time.monotonic()
+        return challenges
+
+def invalidate_challenges_cache():
+    global _challenges_cache, _challenges_version
+    _challenges_version += 1
+    _challenges_cache = None
+
+async def get_active_challenges():
+    # Same semantics as the {"is_active": True} query this replaces
+    return [c for c in await get_challenges_cached() if c.get("is_active") is True]
 
 async def get_active_tasks_dict():
     """Returns a dict of task_id: False for all active challenges"""
-    challenges = await db.challenges.find({"is_active": True}).to_list(length=100)
+    challenges = await get_active_challenges()
     
-    # If no challenges exist yet, return defaults (and seed them if needed, but seeding happens in GET)
+    # If no challenges exist yet, return defaults (seeding happens once at startup)
     if not challenges:
-        return {c["id"]: False for c in DEFAULT_CHALLENGES} | {"photo_logged": False}
-        
-    tasks = {c["id"]: False for c in challenges}
+        return {**_DEFAULT_TASKS}
+    
+    tasks = dict.fromkeys((c["id"] for c in challenges), False)
     tasks["photo_logged"] = False
     return tasks
 
 async def seed_challenges_if_empty():
     count = await db.challenges.count_documents({})
     if count == 0:
-        await db.challenges.insert_many(DEFAULT_CHALLENGES)
+        # Copies: insert_many adds an _id to each document it is given
+        await db.challenges.insert_many([dict(c) for c in DEFAULT_CHALLENGES])
+        invalidate_challenges_cache()
+
+async def get_state(today_str: str):
+    """Returns the global challenge state, creating it on first use"""
+    return await db.state.find_one_and_update(
+        {},
+        {"$setOnInsert": {"start_date": today_str, "current_day": 1, "is_active": True}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+
+def today_log_pipeline(today_str: str, template: Dict[str, bool], day_number: int,
+                       overrides: Optional[Dict[str, bool]] = None,
+                       fields: Optional[Dict[str, Any]] = None):
+    """Update pipeline that creates today's log or syncs it with the active tasks"""
+    # Adds missing template keys; existing values win. Stored keys outside the
+    # template are kept, since the template may come from a stale cache (a
+    # challenge created on another worker) - get_today_log filters them out.
+    tasks = {k: {"$ifNull": [f"$tasks.{k}", v]} for k, v in template.items()}
+    if overrides:
+        tasks.update(overrides)
+    return [{
+        "$set": {
+            "date": today_str,
+            "tasks": {"$mergeObjects": [{"$ifNull": ["$tasks", {}]}, tasks]},
+            "has_photo": {"$ifNull": ["$has_photo", False]},
+            "day_number": {"$ifNull": ["$day_number", day_number]},
+            "is_completed": {"$ifNull": ["$is_completed", False]},
+            **(fields or {})
+        }
+    }]
+
+async def upsert_today_log(today_str: str, overrides: Optional[Dict[str, bool]] = None,
+                           fields: Optional[Dict[str, Any]] = None):
+    """Creates or syncs today's log in one write and returns it (without _id)"""
+    # State and the active tasks configuration are independent reads
+    state, active_tasks_template = await asyncio.gather(
+        get_state(today_str),
+        get_active_tasks_dict()
+    )
+    
+    return await db.daily_logs.find_one_and_update(
+        {"date": today_str},
+        today_log_pipeline(today_str, active_tasks_template, state["current_day"], overrides, fields),
+        upsert=True,
+        projection=LOG_PROJECTION,
+        return_document=ReturnDocument.AFTER
+    )
+
+async def apply_log_updates(today_str: str, tasks: Dict[str, bool], image_base64: Optional[str] = None):
+    """Sets task values (and the photo) on today's log, creating it if missing.
+
+    Returns the stored task map after the update.
+    """
+    overrides = dict(tasks)
+    fields = {}
+    if image_base64:
+        # Only a flag goes on the log so the hot log reads never carry the image
+        overrides["photo_logged"] = True
+        fields["has_photo"] = True
+    
+    updates = {f"tasks.{k}": v for k, v in overrides.items()} | fields
+    log = await db.daily_logs.find_one_and_update(
+        {"date": today_str},
+        {"$set": updates},
+        projection={"_id": 0, "day_number": 1, "tasks": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if not log:
+        log = await upsert_today_log(today_str, overrides, fields)
+    
+    if image_base64:
+        await db.photos.update_one(
+            {"date": today_str},
+            {"$set": {"day_number": log["day_number"], "photo_base64": image_base64}},
+            upsert=True
+        )
+    return log["tasks"]
+
+# --- Startup ---
+
+@app.on_event("startup")
+async def ensure_indexes():
+    # Every hot query is a point lookup on date/id or a sort on day_number
+    await db.daily_logs.create_index("date", unique=True)
+    await db.daily_logs.create_index("day_number")
+    await db.photos.create_index("date", unique=True)
+    await db.photos.create_index([("day_number", 1), ("date", 1)])
+    await db.challenges.create_index("id", unique=True)
+
+@app.on_event("startup")
+async def migrate_inline_photos():
+    # Older logs kept the base64 image on the daily_logs document itself
+    cursor = db.daily_logs.find(
+        {"photo_base64": {"$type": "string"}},
+        {"date": 1, "day_number": 1, "photo_base64": 1}
+    )
+    async for log in cursor:
+        await db.photos.update_one(
+            {"date": log["date"]},
+            {"$set": {"day_number": log["day_number"], "photo_base64": log["photo_base64"]}},
+            upsert=True
+        )
+        await db.daily_logs.update_one(
+            {"_id": log["_id"]},
+            {"$set": {"has_photo": True}, "$unset": {"photo_base64": ""}}
+        )
+    
+    await db.daily_logs.update_many(
+        {"has_photo": {"$exists": False}},
+        {"$set": {"has_photo": False}, "$unset": {"photo_base64": ""}}
+    )
+
+@app.on_event("startup")
+async def seed_challenges():
+    # Once per process instead of a count_documents on every request
+    await seed_challenges_if_empty()
+
+@app.on_event("shutdown")
+async def close_mongo_client():
+    # The one process-wide client; closing it releases its pool and monitors
+    client.close()
 
 # --- Endpoints ---
 
@@ -92,9 +293,7 @@ async def health_check():
 # CHALLENGE MANAGEMENT
 @app.get("/api/challenges")
 async def get_challenges():
-    await seed_challenges_if_empty()
-    challenges = await db.challenges.find({}, {"_id": 0}).to_list(length=100)
-    return challenges
+    return await get_challenges_cached()
 
 @app.post("/api/challenges")
 async def create_challenge(challenge: Challenge):
@@ -103,7 +302,8 @@ async def create_challenge(challenge: Challenge):
     if exists:
         raise HTTPException(status_code=400, detail="Challenge ID already exists")
     
-    await db.challenges.insert_one(challenge.dict())
+    await db.challenges.insert_one(challenge.model_dump())
+    invalidate_challenges_cache()
     return challenge
 
 @app.put("/api/challenges/{challenge_id}")
@@ -112,133 +312,85 @@ async def update_challenge(challenge_id: str, update: Dict[str, Any]):
         {"id": challenge_id},
         {"$set": update}
     )
+    invalidate_challenges_cache()
     return {"status": "updated"}
 
 @app.delete("/api/challenges/{challenge_id}")
 async def delete_challenge(challenge_id: str):
     # Prevent deleting defaults? For now let's allow it, user owns their journey.
     await db.challenges.delete_one({"id": challenge_id})
+    invalidate_challenges_cache()
     return {"status": "deleted"}
 
 
 # DAILY LOGGING
 @app.get("/api/today")
-async def get_today_log():
-    today_str = date.today().isoformat()
-    
-    # Ensure challenges are seeded so we know what tasks to track
-    await seed_challenges_if_empty()
-    
-    # Get global state
-    state = await db.state.find_one({})
-    if not state:
-        state = {
-            "start_date": today_str,
-            "current_day": 1,
-            "is_active": True
-        }
-        await db.state.insert_one(state)
-
-    log = await db.daily_logs.find_one({"date": today_str})
-    
-    # Get currently active tasks configuration
-    active_tasks_template = await get_active_tasks_dict()
-    
-    if not log:
-        # Create new log
-        new_log = {
-            "date": today_str,
-            "tasks": active_tasks_template,
-            "photo_base64": None,
-            "day_number": state["current_day"],
-            "is_completed": False
-        }
-        await db.daily_logs.insert_one(new_log)
-        log = new_log
-    else:
-        # SYNC: If new challenges were added since the log was created, 
-        # we need to make sure they exist in the log's tasks dict.
-        # However, we should preserve the existing boolean values.
-        current_tasks = log.get("tasks", {})
-        merged_tasks = active_tasks_template.copy() # Start with current definition
-        
-        # Overwrite with existing values where they exist
-        for k, v in current_tasks.items():
-            if k in merged_tasks:
-                merged_tasks[k] = v
-            # If a task was deleted/disabled, it effectively disappears from the UI 
-            # because the UI iterates over `challenges`, but we keep the data here safely or drop it.
-            # Let's keep it clean: The UI drives the keys.
-            
-        # Update DB if keys changed
-        if set(merged_tasks.keys()) != set(current_tasks.keys()):
-            await db.daily_logs.update_one(
-                {"date": today_str},
-                {"$set": {"tasks": merged_tasks}}
-            )
-            log["tasks"] = merged_tasks
-    
-    if "_id" in log:
-        del log["_id"]
-        
+async def get_today_log(today_str: str = Depends(today_dep)):
+    # Create the log if missing, otherwise add newly created challenges while
+    # preserving existing values - in one round-trip.
+    log = await upsert_today_log(today_str)
+    # Removed challenges stay stored but are not shown (the cache is warm here)
+    active_tasks = await get_active_tasks_dict()
+    log["tasks"] = {k: v for k, v in log["tasks"].items() if k in active_tasks}
     return log
 
 @app.put("/api/log/task")
-async def update_task(update: TaskUpdate):
-    today_str = date.today().isoformat()
-    
+async def update_task(update: TaskUpdate, today_str: str = Depends(today_dep)):
     # Update the specific task
     result = await db.daily_logs.update_one(
         {"date": today_str},
         {"$set": {f"tasks.{update.task_id}": update.completed}}
     )
     
-    if result.modified_count == 0:
-        # Create if missing
-        await get_today_log()
-        await db.daily_logs.update_one(
-            {"date": today_str},
-            {"$set": {f"tasks.{update.task_id}": update.completed}}
-        )
+    # matched (not modified) - re-sending the current value is not a miss
+    if result.matched_count == 0:
+        # No log yet today: create it with the update applied in the same write
+        await upsert_today_log(today_str, {update.task_id: update.completed})
             
     return {"status": "updated"}
 
 @app.post("/api/log/photo")
-async def upload_photo(upload: PhotoUpload):
-    today_str = date.today().isoformat()
-    if not upload.image_base64:
+async def upload_photo(file: UploadFile = File(...), today_str: str = Depends(today_dep)):
+    # Multipart bytes skip the JSON parse + validation of a multi-MB string
+    data = await file.read()
+    if not data:
         raise HTTPException(status_code=400, detail="No image data")
 
-    await db.daily_logs.update_one(
-        {"date": today_str},
-        {
-            "$set": {
-                "photo_base64": upload.image_base64,
-                "tasks.photo_logged": True
-            }
-        }
-    )
+    # Stored as base64 so the gallery/today screens keep using data: URIs
+    await apply_log_updates(today_str, {}, base64.b64encode(data).decode("ascii"))
     return {"status": "photo_saved"}
 
+@app.put("/api/log/batch")
+async def update_log_batch(batch: BatchLog, today_str: str = Depends(today_dep)):
+    # Several task toggles (and optionally the photo) in one request/write
+    if not batch.tasks and not batch.image_base64:
+        raise HTTPException(status_code=400, detail="Nothing to update")
+
+    # The stored values rather than an echo of the request
+    tasks = await apply_log_updates(today_str, batch.tasks, batch.image_base64)
+    return {"status": "updated", "tasks": tasks}
+
 @app.post("/api/complete_day")
-async def complete_day():
-    today_str = date.today().isoformat()
-    log = await db.daily_logs.find_one({"date": today_str})
+async def complete_day(today_str: str = Depends(today_dep)):
+    # We fetch active challenges alongside the log to know what MUST be true.
+    # Read fresh rather than from the cache, which may miss a challenge
+    # created on another worker.
+    log, active_challenges = await asyncio.gather(
+        db.daily_logs.find_one(
+            {"date": today_str},
+            {"_id": 0, "tasks": 1, "is_completed": 1, "day_number": 1}
+        ),
+        db.challenges.find({"is_active": True}, {"_id": 0, "id": 1}).to_list(length=100)
+    )
     
     if not log:
         raise HTTPException(status_code=404, detail="Log not found")
     
     # Verify all active tasks are done
-    # We fetch active challenges to know what MUST be true
-    active_challenges = await db.challenges.find({"is_active": True}).to_list(length=100)
-    required_keys = [c["id"] for c in active_challenges] + ["photo_logged"]
-    
     tasks = log.get("tasks", {})
-    all_done = True
-    for key in required_keys:
-        if not tasks.get(key, False):
-            all_done = False
-            break
+    all_done = tasks.get("photo_logged", False) and all(
+        tasks.get(c["id"], False) for c in active_challenges
+    )
             
     if not all_done:
         raise HTTPException(status_code=400, detail="Not all active tasks are completed")
@@ -259,16 +411,13 @@ async def complete_day():
     return {"status": "day_completed", "next_day": log["day_number"] + 1}
 
 @app.post("/api/reset")
-async def reset_progress():
-    today_str = date.today().isoformat()
-    
+async def reset_progress(today_str: str = Depends(today_dep)):
     new_state = {
         "start_date": today_str,
         "current_day": 1,
         "is_active": True
     }
-    await db.state.delete_many({})
-    await db.state.insert_one(new_state)
+    await db.state.replace_one({}, new_state, upsert=True)
     
     # Get fresh tasks
     active_tasks = await get_active_tasks_dict()
@@ -280,26 +429,52 @@ async def reset_progress():
                 "day_number": 1, 
                 "is_completed": False,
                 "tasks": active_tasks,
-                "photo_base64": None
+                "has_photo": False
             }
         }
     )
+    await db.photos.delete_one({"date": today_str})
     
     return {"status": "reset_successful", "current_day": 1}
 
 # --- VISUALIZATION ENDPOINTS ---
 
+# Upper bound on one page; the default returns everything the old fixed 365 did
+MAX_PAGE_SIZE = 365
+
 @app.get("/api/history")
-async def get_history():
-    cursor = db.daily_logs.find({}, {"_id": 0, "photo_base64": 0}).sort("date", 1)
-    logs = await cursor.to_list(length=365)
+async def get_history(skip: int = Query(0, ge=0), limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
+    cursor = db.daily_logs.find({}, LOG_PROJECTION).sort("date", 1).skip(skip).limit(limit)
+    logs = await cursor.to_list(length=limit)
     return logs
 
 @app.get("/api/photos")
-async def get_photos():
-    cursor = db.daily_logs.find(
-        {"photo_base64": {"$ne": None}}, 
+async def get_photos(skip: int = Query(0, ge=0), limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)):
+    # date breaks ties between runs (after a reset) so pages are stable
+    # Small batches: each document carries a full image
+    cursor = db.photos.find(
+        {},
         {"_id": 0, "day_number": 1, "photo_base64": 1, "date": 1}
-    ).sort("day_number", 1)
-    photos = await cursor.to_list(length=365)
-    return photos
+    ).sort([("day_number", 1), ("date", 1)]).skip(skip).limit(limit).batch_size(16)
+    
+    async def stream_photos():
+        # Still a plain JSON array for clients, but written one photo at a
+        # time instead of buffering the whole gallery in memory first
+        yield b"["
+        separator = b""
+        async for photo in cursor:
+            yield separator + orjson.dumps(photo)
+            separator = b","
+        yield b"]"
+    
+    return StreamingResponse(stream_photos(), media_type="application/json")
+
+@app.get("/api/photos/{photo_date}")
+async def get_photo(photo_date: str):
+    photo = await db.photos.find_one(
+        {"date": photo_date},
+        {"_id": 0, "day_number": 1, "photo_base64": 1, "date": 1}
+    )
+    if not photo:
+        raise HTTPException(status_code=404, detail="Photo not found")
+    return photo
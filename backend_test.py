@@ -5,27 +5,393 @@ Tests all the core functionality of the 75 Hard Challenge tracker backend.
 """
 
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.filepost import encode_multipart_formdata
+from urllib3.response import HTTPResponse
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+import atexit
+import hashlib
+import io
+import logging
+import orjson
+import os
+import signal
+import socket
+import statistics
 import sys
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from datetime import datetime
 
+try:
+    import ijson
+except ImportError:  # fall back to decoding the whole body
+    ijson = None
+
 # Backend URL from frontend .env
 BASE_URL = "https://challenge75-1.preview.emergentagent.com/api"
 
+# Endpoint URLs, built once
+URL_HEALTH = f"{BASE_URL}/health"
+URL_TODAY = f"{BASE_URL}/today"
+URL_LOG_TASK = f"{BASE_URL}/log/task"
+URL_LOG_BATCH = f"{BASE_URL}/log/batch"
+URL_LOG_PHOTO = f"{BASE_URL}/log/photo"
+URL_COMPLETE = f"{BASE_URL}/complete_day"
+URL_RESET = f"{BASE_URL}/reset"
+URL_HISTORY = f"{BASE_URL}/history"
+URL_PHOTOS = f"{BASE_URL}/photos"
+URL_PHOTO_MISSING = f"{URL_PHOTOS}/1970-01-01"  # no photo is ever logged for this date
+URL_CHALLENGES = f"{BASE_URL}/challenges"
+URL_TEST_CHALLENGE = f"{URL_CHALLENGES}/run_1_mile"  # created and removed by the challenge workflow
+
+# One session for the whole run so calls reuse the keep-alive TLS connection
+# instead of paying a fresh TCP+TLS handshake per request
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose sockets keep TCP_NODELAY and also enable SO_KEEPALIVE"""
+    socket_options = HTTPConnection.default_socket_options + [
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+# TEST_MODE picks the transport:
+#   smoke  (default) talks to BASE_URL
+#   record talks to BASE_URL and writes every exchange to the cassette
+#   replay serves the cassette without opening a socket, so only the
+#          contract checks (fields, types, list vs dict) cost anything
+TEST_MODE = os.environ.get("TEST_MODE", "smoke")
+if TEST_MODE not in ("smoke", "record", "replay"):
+    raise SystemExit(f"TEST_MODE must be smoke, record or replay, not {TEST_MODE!r}")
+CASSETTE = os.environ.get(
+    "BACKEND_TEST_CASSETTE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "cassettes", "75hard.json"),
+)
+if TEST_MODE == "replay" and not os.path.isfile(CASSETTE):
+    raise SystemExit(f"No cassette at {CASSETTE}; record one first with TEST_MODE=record")
+
+class CassetteAdapter(HTTPAdapter):
+    """Record responses from a live adapter, or serve them back from the cassette.
+
+    The API is stateful (GET /today changes as the run goes on), so responses
+    are kept per method, URL and body hash and replayed in recorded order; the
+    last one repeats once a queue runs dry.
+    """
+
+    @staticmethod
+    def key(method, url, body):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        return method, url, hashlib.sha1(body or b"").hexdigest()
+
+    def __init__(self, path, mode, live=None):
+        super().__init__()
+        self.path, self.mode, self.live = path, mode, live
+        self._lock = threading.Lock()
+        self.interactions = []
+        self.queues = defaultdict(deque)
+        if mode == "record":
+            atexit.register(self.save)
+        else:
+            with open(path, "rb") as f:
+                for interaction in orjson.loads(f.read()):
+                    self.queues[interaction["method"], interaction["url"], interaction["body_sha1"]].append(interaction)
+
+    def send(self, request, **kwargs):
+        if self.mode == "record":
+            response = self.live.send(request, **kwargs)
+            # Stored decoded, so the replayed body carries no Content-Encoding
+            headers = {k: v for k, v in response.headers.items()
+                       if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")}
+            method, url, body_sha1 = self.key(request.method, request.url, request.body)
+            interaction = {"method": method, "url": url, "body_sha1": body_sha1, "status": response.status_code,
+                           "headers": headers, "body": response.content.decode("utf-8")}
+            with self._lock:
+                self.interactions.append(interaction)
+        else:
+            with self._lock:
+                queue = self.queues.get(self.key(request.method, request.url, request.body))
+                if not queue:
+                    raise requests.ConnectionError(f"No recorded response for {request.method} {request.url}")
+                interaction = queue.popleft() if len(queue) > 1 else queue[0]
+        raw = HTTPResponse(
+            body=io.BytesIO(interaction["body"].encode("utf-8")),
+            headers=interaction["headers"],
+            status=interaction["status"],
+            preload_content=False,
+        )
+        return self.build_response(request, raw)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "wb") as f:
+            f.write(orjson.dumps(self.interactions, option=orjson.OPT_INDENT_2))
+
+    def close(self):
+        super().close()
+        if self.live is not None:
+            self.live.close()
+
+# (connect, read) seconds per call; a stuck backend fails fast instead of
+# stalling every call for 10s, and SUITE_DEADLINE bounds the whole run
+TIMEOUT = (3.05, 5.0)
+SUITE_DEADLINE = 120
+
+# For bodies pre-encoded with orjson (json= would re-encode with stdlib json)
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+def rjson(response):
+    """Decode a response body with orjson instead of response.json()'s stdlib decoder"""
+    return orjson.loads(response.content)
+
+# Static request bodies, encoded once at import
+TOGGLE_TASKS = ("diet", "water", "reading")
+REMAINING_TASKS = ("workout_1", "workout_2", "no_alcohol")
+# The first toggle goes through PUT /log/task, the endpoint the app uses per tap
+TOGGLE_TASK = orjson.dumps({"task_id": TOGGLE_TASKS[0], "completed": True})
+TOGGLE_BATCH = orjson.dumps({"tasks": dict.fromkeys(TOGGLE_TASKS[1:], True)})
+REMAINING_BATCH = orjson.dumps({"tasks": dict.fromkeys(REMAINING_TASKS, True)})
+NEW_CHALLENGE_BODY = orjson.dumps({
+    "id": "run_1_mile",
+    "label": "Run 1 Mile",
+    "sub": "Daily cardio challenge",
+    "icon": "Activity",
+    "is_active": True,
+})
+INACTIVE_BODY = orjson.dumps({"is_active": False})
+# Fixed boundary so the body (and its cassette key) is identical across runs
+PHOTO_BODY, _photo_content_type = encode_multipart_formdata(
+    {"file": ("photo.jpg", b"dummy", "image/jpeg")}, boundary="backend-test-photo"
+)
+PHOTO_HEADERS = {"Content-Type": _photo_content_type, "Content-Length": str(len(PHOTO_BODY))}
+
+@lru_cache(maxsize=None)
+def get_session():
+    """Build the pooled session once per process; conftest.py hands out the same one"""
+    session = requests.Session()
+    # Advertise every encoding urllib3 can decode here (br/zstd only when their
+    # packages are installed) rather than requests' fixed "gzip, deflate"
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    # Retry's defaults skip POST, so complete_day/reset are never replayed
+    adapter = KeepAliveAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+    )
+    if TEST_MODE != "smoke":
+        adapter = CassetteAdapter(CASSETTE, TEST_MODE, live=adapter)
+    # Same pool and retry policy when BASE_URL points at a plain-HTTP local backend
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+SESSION = get_session()
+
+# The mutating calls never vary, so they are prepared once instead of
+# re-merging headers, cookies and hooks through Session.request() each time
+def prepare(method, url, body=None, headers=None):
+    return SESSION.prepare_request(requests.Request(method, url, data=body, headers=headers))
+
+# Environment proxies/CA bundle, which Session.send() alone would not pick up
+SEND_SETTINGS = SESSION.merge_environment_settings(BASE_URL, {}, None, None, None)
+
+def send_prepared(prepared):
+    return SESSION.send(prepared.copy(), timeout=TIMEOUT, **SEND_SETTINGS)
+
+PREPARED_TASK = prepare("PUT", URL_LOG_TASK, TOGGLE_TASK, JSON_HEADERS)
+PREPARED_TOGGLE = prepare("PUT", URL_LOG_BATCH, TOGGLE_BATCH, JSON_HEADERS)
+PREPARED_REMAINING = prepare("PUT", URL_LOG_BATCH, REMAINING_BATCH, JSON_HEADERS)
+PREPARED_PHOTO = prepare("POST", URL_LOG_PHOTO, PHOTO_BODY, PHOTO_HEADERS)
+PREPARED_COMPLETE = prepare("POST", URL_COMPLETE)
+
+# Last GET /today response. Mutating calls mark it stale; a stale entry is only
+# reused if the server answers its ETag with 304 Not Modified.
+_TODAY_CACHE = {"data": None, "etag": None, "stale": True}
+
+# Other idempotent GETs are reused for a few seconds within one run, keyed by
+# (URL, fetcher) since different fetchers return differently shaped results
+GET_CACHE_TTL = 5.0
+_GET_CACHE = {}
+
+def invalidate(*prefixes):
+    """Drop cached GETs whose URL starts with any of the prefixes"""
+    for key in [key for key in _GET_CACHE if key[0].startswith(prefixes)]:
+        _GET_CACHE.pop(key, None)
+
+def invalidate_today():
+    _TODAY_CACHE["stale"] = True
+    invalidate(URL_HISTORY, URL_PHOTOS)
+
+def fetch_json(url):
+    with results.time("GET " + url.removeprefix(BASE_URL)):
+        response = SESSION.get(url, timeout=TIMEOUT)
+    return response.status_code, rjson(response) if response.status_code == 200 else None
+
+def fetch_status(url):
+    with results.time("GET " + url.removeprefix(BASE_URL)):
+        return (SESSION.get(url, timeout=TIMEOUT).status_code,)
+
+def cached_get(url, fetch=fetch_status):
+    """Return fetch(url), reusing a 200 result from the last GET_CACHE_TTL seconds.
+
+    fetch returns a tuple whose first item is the status code.
+    """
+    now = time.monotonic()
+    hit = _GET_CACHE.get((url, fetch))
+    if hit is not None and hit[0] > now:
+        return hit[1]
+    value = fetch(url)
+    if value[0] == 200:
+        _GET_CACHE[url, fetch] = (now + GET_CACHE_TTL, value)
+    return value
+
+def get_today_cached():
+    """GET /today, reusing the last response until a mutating call invalidates it"""
+    if not _TODAY_CACHE["stale"]:
+        return 200, _TODAY_CACHE["data"]
+    
+    headers = {}
+    if _TODAY_CACHE["etag"] and _TODAY_CACHE["data"] is not None:
+        headers["If-None-Match"] = _TODAY_CACHE["etag"]
+    with results.time("GET /today"):
+        response = SESSION.get(URL_TODAY, headers=headers, timeout=TIMEOUT)
+    
+    if response.status_code == 304:
+        _TODAY_CACHE["stale"] = False
+        return 200, _TODAY_CACHE["data"]
+    if response.status_code != 200:
+        return response.status_code, None
+    
+    _TODAY_CACHE.update(data=rjson(response), etag=response.headers.get("ETag"), stale=False)
+    return 200, _TODAY_CACHE["data"]
+
+def fetch_list_head(url):
+    """GET a JSON array and return (status_code, count, first_item).
+
+    With ijson available only the first element is materialized; the rest
+    of the array is scanned for its length. count is None when the body
+    is not an array.
+    """
+    # Timed to the end of the scan, since the body is read lazily
+    with results.time("GET " + url.removeprefix(BASE_URL)), \
+            SESSION.get(url, stream=True, timeout=TIMEOUT) as response:
+        if response.status_code != 200:
+            return response.status_code, None, None
+        if ijson is None:
+            data = rjson(response)
+            if not isinstance(data, list):
+                return 200, None, None
+            return 200, len(data), data[0] if data else None
+
+        response.raw.decode_content = True  # let urllib3 undo gzip
+        events = ijson.parse(response.raw)
+        if next(events, None) != ("", "start_array", None):
+            return 200, None, None
+        count, first, builder = 0, None, None
+        for prefix, event, value in events:
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == "item" and event == "end_map":
+                    first, builder = builder.value, None
+            elif prefix == "item" and event == "start_map":
+                count += 1
+                if count == 1:
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+        return 200, count, first
+
+def make_validator(required=(), tasks=(), excluded=(), non_null=()):
+    """Build a checker for one response shape; it returns a problem description, or None"""
+    required, tasks, excluded, non_null = map(frozenset, (required, tasks, excluded, non_null))
+
+    def validate(data):
+        # Set differences against the key views report every missing key at once
+        missing = required - data.keys()
+        if missing:
+            return f"Missing fields: {sorted(missing)}"
+        missing = tasks - data["tasks"].keys() if tasks else None
+        if missing:
+            return f"Missing tasks: {sorted(missing)}"
+        present = excluded & data.keys()
+        if present:
+            return f"{sorted(present)} should be excluded"
+        null = [field for field in non_null if data[field] is None]
+        if null:
+            return f"{sorted(null)} should not be None"
+        return None
+
+    return validate
+
+LOG_FIELDS = ("date", "tasks", "day_number", "is_completed")
+TASK_IDS = ("diet", "workout_1", "workout_2", "water", "reading", "no_alcohol", "photo_logged")
+validate_today = make_validator(LOG_FIELDS, tasks=TASK_IDS)
+validate_history_item = make_validator(LOG_FIELDS, excluded=("photo_base64",))
+validate_photo_item = make_validator(("day_number", "photo_base64", "date"), non_null=("photo_base64",))
+validate_calendar_log = make_validator(("is_completed", "tasks", "date"))
+
+logger = logging.getLogger("backend_test")
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """StreamHandler that flushes every flush_every records instead of every record.
+
+    Pass/fail records and print() output share the same stream, so they stay
+    in order. A CI log still shows progress every few checks, and a killed
+    job loses at most the last few records.
+    """
+    flush_every = 5
+
+    def __init__(self, stream=None):
+        super().__init__(stream)
+        self._unflushed = 0
+
+    def flush(self):
+        pass  # emit() decides when the stream is flushed
+
+    def emit(self, record):
+        super().emit(record)
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every:
+            self._unflushed = 0
+            super().flush()
+
 class TestResults:
+    __test__ = False  # not a pytest test class
+    
     def __init__(self):
         self.passed = 0
         self.failed = 0
         self.errors = []
+        self.timings = defaultdict(list)  # endpoint -> request durations in ns
+        self._lock = threading.Lock()  # parallel batches log from worker threads
+    
+    @contextmanager
+    def time(self, name):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            with self._lock:
+                self.timings[name].append(elapsed)
     
     def log_pass(self, test_name):
-        print(f"✅ PASS: {test_name}")
-        self.passed += 1
+        logger.info("✅ PASS: %s", test_name)
+        with self._lock:
+            self.passed += 1
     
     def log_fail(self, test_name, error):
-        print(f"❌ FAIL: {test_name} - {error}")
-        self.failed += 1
-        self.errors.append(f"{test_name}: {error}")
+        logger.error("❌ FAIL: %s - %s", test_name, error)
+        with self._lock:
+            self.failed += 1
+            self.errors.append((test_name, error))
     
     def summary(self):
         total = self.passed + self.failed
@@ -33,20 +399,38 @@ class TestResults:
         print(f"TEST SUMMARY: {self.passed}/{total} tests passed")
         if self.errors:
             print("\nFAILED TESTS:")
-            for error in self.errors:
-                print(f"  - {error}")
+            print("\n".join(f"  - {name}: {error}" for name, error in self.errors))
+        if self.timings:
+            print("\nLATENCY (slowest total first):")
+            for name, samples in sorted(self.timings.items(), key=lambda kv: -sum(kv[1])):
+                p50 = statistics.median(samples) / 1e6
+                p95 = (statistics.quantiles(samples, n=20, method="inclusive")[-1] if len(samples) > 1 else samples[0]) / 1e6
+                print(f"  {name}: n={len(samples)} p50={p50:.1f}ms p95={p95:.1f}ms total={sum(samples) / 1e6:.1f}ms")
         print(f"{'='*50}")
+        sys.stdout.flush()
         return self.failed == 0
 
+results = TestResults()
+
+# Set once test_complete_all_tasks has posted today's tasks and photo, cleared by
+# a reset. run_visualization_tests only seeds data when this is False, so a run
+# after run_all_tests (in the same process) reuses what is already on the server.
+_DATA_SEEDED = False
+
+def parallel_safe(test):
+    """Tag a test that only reads server state, so it may run alongside other tagged tests"""
+    test.parallel_safe = True
+    return test
+
 def test_health_check():
     """Test basic health endpoint"""
     try:
-        response = requests.get(f"{BASE_URL}/health", timeout=10)
-        if response.status_code == 200:
+        status_code, = cached_get(URL_HEALTH)
+        if status_code == 200:
             results.log_pass("Health check")
             return True
         else:
-            results.log_fail("Health check", f"Status code: {response.status_code}")
+            results.log_fail("Health check", f"Status code: {status_code}")
             return False
     except Exception as e:
         results.log_fail("Health check", f"Connection error: {str(e)}")
@@ -55,85 +439,141 @@ def test_health_check():
 def test_get_today_initial():
     """Test GET /api/today to initialize the day"""
     try:
-        response = requests.get(f"{BASE_URL}/today", timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            # Verify structure
-            required_fields = ['date', 'tasks', 'day_number', 'is_completed']
-            for field in required_fields:
-                if field not in data:
-                    results.log_fail("GET /today structure", f"Missing field: {field}")
-                    return None
-            
-            # Verify tasks structure
-            expected_tasks = ['diet', 'workout_1', 'workout_2', 'water', 'reading', 'no_alcohol', 'photo_logged']
-            for task in expected_tasks:
-                if task not in data['tasks']:
-                    results.log_fail("GET /today tasks", f"Missing task: {task}")
-                    return None
+        status_code, data = get_today_cached()
+        if status_code == 200:
+            # Verify structure, including every task key
+            problem = validate_today(data)
+            if problem:
+                results.log_fail("GET /today structure", problem)
+                return None
             
             results.log_pass("GET /today - Initialize day")
             return data
         else:
-            results.log_fail("GET /today", f"Status code: {response.status_code}")
+            results.log_fail("GET /today", f"Status code: {status_code}")
             return None
     except Exception as e:
         results.log_fail("GET /today", f"Error: {str(e)}")
         return None
 
+def gather(*calls):
+    """Run zero-argument callables concurrently; results come back in call order"""
+    # Threads are enough here: every call spends its time waiting on the network
+    with ThreadPoolExecutor(max_workers=min(8, len(calls))) as executor:
+        futures = [executor.submit(call) for call in calls]
+    return [future.result() for future in futures]
+
+def prefetch():
+    """Warm the /today, /history and /photos caches concurrently before a read-only batch"""
+    # Otherwise every test in the batch misses the cold cache at once and
+    # sends its own copy of the same GET
+    try:
+        gather(
+            get_today_cached,
+            lambda: cached_get(URL_HISTORY, fetch_list_head),
+            lambda: cached_get(URL_PHOTOS, fetch_list_head),
+        )
+    except Exception:
+        pass  # connection errors and non-JSON bodies alike; the tests report them
+
+def api_call(method, url, test_name, *, body=None, expect=200, cache=False):
+    """Send one API request with the suite's standard checks.
+
+    url is one of the URL_* constants and body is pre-encoded JSON. Mutating
+    calls clear every run cache; cache=True serves GETs from those caches.
+    Returns the decoded body, or None once a bad status or request error has
+    been logged under test_name.
+    """
+    try:
+        if method == "GET" and cache:
+            status_code, data = get_today_cached() if url == URL_TODAY else cached_get(url, fetch_json)
+            if status_code != expect:
+                results.log_fail(test_name, f"Status code: {status_code}")
+                return None
+            return data
+        
+        with results.time(f"{method} {url.removeprefix(BASE_URL)}"):
+            response = SESSION.request(
+                method, url, data=body, headers=JSON_HEADERS if body is not None else None, timeout=TIMEOUT
+            )
+        if method != "GET":
+            invalidate_today()
+            invalidate(BASE_URL)  # every cached GET
+        if response.status_code != expect:
+            results.log_fail(test_name, f"Status code: {response.status_code}, Response: {response.text}")
+            return None
+        return rjson(response)
+    except Exception as e:
+        results.log_fail(test_name, f"Error: {str(e)}")
+        return None
+
+def bulk_toggle(prepared):
+    """Send a prepared batch of task updates; returns today's stored task map afterwards"""
+    invalidate_today()
+    with results.time("PUT /log/batch"):
+        response = send_prepared(prepared)
+    if response.status_code != 200:
+        raise RuntimeError(f"Status code: {response.status_code}")
+    return rjson(response).get("tasks", {})
+
 def test_toggle_tasks():
-    """Test PUT /api/log/task to toggle tasks"""
-    tasks_to_toggle = [
-        {"task_id": "diet", "completed": True},
-        {"task_id": "water", "completed": True},
-        {"task_id": "reading", "completed": True}
-    ]
+    """Test PUT /api/log/task and PUT /api/log/batch to toggle tasks"""
+    try:
+        invalidate_today()
+        with results.time("PUT /log/task"):
+            response = send_prepared(PREPARED_TASK)
+        if response.status_code != 200:
+            results.log_fail(f"Toggle task {TOGGLE_TASKS[0]}", f"Status code: {response.status_code}")
+            return False
+        # The batch response carries the stored map, so it also shows the
+        # single-task write above
+        applied = bulk_toggle(PREPARED_TOGGLE)
+    except Exception as e:
+        results.log_fail("Toggle tasks", f"Error: {str(e)}")
+        return False
     
-    for task_update in tasks_to_toggle:
-        try:
-            response = requests.put(
-                f"{BASE_URL}/log/task",
-                json=task_update,
-                headers={"Content-Type": "application/json"},
-                timeout=10
-            )
-            if response.status_code == 200:
-                results.log_pass(f"Toggle task {task_update['task_id']}")
-            else:
-                results.log_fail(f"Toggle task {task_update['task_id']}", f"Status code: {response.status_code}")
-                return False
-        except Exception as e:
-            results.log_fail(f"Toggle task {task_update['task_id']}", f"Error: {str(e)}")
+    for task_id in TOGGLE_TASKS:
+        if applied.get(task_id) is True:
+            results.log_pass(f"Toggle task {task_id}")
+        else:
+            results.log_fail(f"Toggle task {task_id}", "Not stored on today's log")
             return False
     
     return True
 
-def test_verify_log_updated():
-    """Verify the log is updated after toggling tasks"""
+def fetch_today(test_name="GET /today"):
+    """Fetch today's log once; verifiers take the returned dict instead of re-fetching"""
     try:
-        response = requests.get(f"{BASE_URL}/today", timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            # Check if the tasks we toggled are now True
-            expected_true_tasks = ['diet', 'water', 'reading']
-            for task in expected_true_tasks:
-                if not data['tasks'].get(task, False):
-                    results.log_fail("Verify log updated", f"Task {task} not updated to True")
-                    return False
-            
-            results.log_pass("Verify log updated")
-            return True
-        else:
-            results.log_fail("Verify log updated", f"Status code: {response.status_code}")
-            return False
+        status_code, data = get_today_cached()
+        if status_code != 200:
+            results.log_fail(test_name, f"Status code: {status_code}")
+            return None
+        return data
     except Exception as e:
-        results.log_fail("Verify log updated", f"Error: {str(e)}")
+        results.log_fail(test_name, f"Error: {str(e)}")
+        return None
+
+def test_verify_log_updated(today):
+    """Verify the log is updated after toggling tasks"""
+    if today is None:
         return False
+    
+    # Check if the tasks we toggled are now True
+    done = {task for task, completed in today['tasks'].items() if completed}
+    not_updated = frozenset(TOGGLE_TASKS) - done
+    if not_updated:
+        results.log_fail("Verify log updated", f"Tasks {sorted(not_updated)} not updated to True")
+        return False
+    
+    results.log_pass("Verify log updated")
+    return True
 
 def test_complete_day_should_fail():
     """Test POST /api/complete_day (should fail because not all tasks done)"""
     try:
-        response = requests.post(f"{BASE_URL}/complete_day", timeout=10)
+        with results.time("POST /complete_day"):
+            response = send_prepared(PREPARED_COMPLETE)
+        invalidate_today()
         if response.status_code == 400:
             results.log_pass("Complete day (should fail)")
             return True
@@ -146,39 +586,27 @@ def test_complete_day_should_fail():
 
 def test_complete_all_tasks():
     """Complete all remaining tasks and upload photo"""
+    global _DATA_SEEDED
     # First, complete remaining tasks
-    remaining_tasks = [
-        {"task_id": "workout_1", "completed": True},
-        {"task_id": "workout_2", "completed": True},
-        {"task_id": "no_alcohol", "completed": True}
-    ]
+    try:
+        applied = bulk_toggle(PREPARED_REMAINING)
+    except Exception as e:
+        results.log_fail("Complete remaining tasks", f"Error: {str(e)}")
+        return False
     
-    for task_update in remaining_tasks:
-        try:
-            response = requests.put(
-                f"{BASE_URL}/log/task",
-                json=task_update,
-                headers={"Content-Type": "application/json"},
-                timeout=10
-            )
-            if response.status_code != 200:
-                results.log_fail(f"Complete task {task_update['task_id']}", f"Status code: {response.status_code}")
-                return False
-        except Exception as e:
-            results.log_fail(f"Complete task {task_update['task_id']}", f"Error: {str(e)}")
+    for task_id in REMAINING_TASKS:
+        if applied.get(task_id) is not True:
+            results.log_fail(f"Complete task {task_id}", "Not stored on today's log")
             return False
     
     # Upload dummy photo
     try:
-        photo_data = {"image_base64": "dummy"}
-        response = requests.post(
-            f"{BASE_URL}/log/photo",
-            json=photo_data,
-            headers={"Content-Type": "application/json"},
-            timeout=10
-        )
+        with results.time("POST /log/photo"):
+            response = send_prepared(PREPARED_PHOTO)
+        invalidate_today()
         if response.status_code == 200:
             results.log_pass("Upload dummy photo")
+            _DATA_SEEDED = True
             return True
         else:
             results.log_fail("Upload dummy photo", f"Status code: {response.status_code}")
@@ -190,9 +618,11 @@ def test_complete_all_tasks():
 def test_complete_day_should_succeed():
     """Test POST /api/complete_day (should succeed now)"""
     try:
-        response = requests.post(f"{BASE_URL}/complete_day", timeout=10)
+        with results.time("POST /complete_day"):
+            response = send_prepared(PREPARED_COMPLETE)
+        invalidate_today()
         if response.status_code == 200:
-            data = response.json()
+            data = rjson(response)
             if data.get('status') == 'day_completed':
                 results.log_pass("Complete day (should succeed)")
                 return data
@@ -206,48 +636,44 @@ def test_complete_day_should_succeed():
         results.log_fail("Complete day (should succeed)", f"Error: {str(e)}")
         return None
 
-def test_verify_next_day():
+def test_verify_next_day(today):
     """Verify GET /api/today shows next day or completion status"""
-    try:
-        response = requests.get(f"{BASE_URL}/today", timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            # The issue: since we're on the same calendar date, the day_number doesn't increment
-            # This is a design issue - the API should either:
-            # 1. Update the existing log's day_number when state increments, OR
-            # 2. Use a different mechanism for tracking challenge days vs calendar days
-            
-            if data.get('day_number') == 2:
-                results.log_pass("Verify next day (Day 2)")
-                return True
-            elif data.get('day_number') == 1 and data.get('is_completed') == True:
-                # This is the actual behavior - same calendar day, so day_number stays 1
-                results.log_fail("Verify next day", "Backend design issue: day_number not updated after completion on same calendar date")
-                return False
-            else:
-                results.log_fail("Verify next day", f"Unexpected state: day {data.get('day_number')}, completed: {data.get('is_completed')}")
-                return False
-        else:
-            results.log_fail("Verify next day", f"Status code: {response.status_code}")
-            return False
-    except Exception as e:
-        results.log_fail("Verify next day", f"Error: {str(e)}")
+    if today is None:
+        return False
+    
+    # The issue: since we're on the same calendar date, the day_number doesn't increment
+    # This is a design issue - the API should either:
+    # 1. Update the existing log's day_number when state increments, OR
+    # 2. Use a different mechanism for tracking challenge days vs calendar days
+    
+    if today.get('day_number') == 2:
+        results.log_pass("Verify next day (Day 2)")
+        return True
+    elif today.get('day_number') == 1 and today.get('is_completed') == True:
+        # This is the actual behavior - same calendar day, so day_number stays 1
+        results.log_fail("Verify next day", "Backend design issue: day_number not updated after completion on same calendar date")
+        return False
+    else:
+        results.log_fail("Verify next day", f"Unexpected state: day {today.get('day_number')}, completed: {today.get('is_completed')}")
         return False
 
 def test_reset_progress():
     """Test POST /api/reset and verify back to Day 1"""
+    global _DATA_SEEDED
     try:
         # Reset progress
-        response = requests.post(f"{BASE_URL}/reset", timeout=10)
+        with results.time("POST /reset"):
+            response = SESSION.post(URL_RESET, timeout=TIMEOUT)
+        invalidate_today()
         if response.status_code == 200:
-            data = response.json()
+            data = rjson(response)
             if data.get('status') == 'reset_successful' and data.get('current_day') == 1:
                 results.log_pass("Reset progress")
+                _DATA_SEEDED = False
                 
                 # Verify we're back to Day 1
-                response = requests.get(f"{BASE_URL}/today", timeout=10)
-                if response.status_code == 200:
-                    today_data = response.json()
+                today_data = fetch_today("Verify reset to Day 1")
+                if today_data is not None:
                     if today_data.get('day_number') == 1:
                         results.log_pass("Verify reset to Day 1")
                         
@@ -263,7 +689,6 @@ def test_reset_progress():
                         results.log_fail("Verify reset to Day 1", f"Expected day 1, got day {today_data.get('day_number')}")
                         return False
                 else:
-                    results.log_fail("Verify reset to Day 1", f"Status code: {response.status_code}")
                     return False
             else:
                 results.log_fail("Reset progress", f"Unexpected response: {data}")
@@ -275,103 +700,153 @@ def test_reset_progress():
         results.log_fail("Reset progress", f"Error: {str(e)}")
         return False
 
+@parallel_safe
 def test_history_endpoint():
     """Test GET /api/history endpoint"""
     try:
-        response = requests.get(f"{BASE_URL}/history", timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            
+        status_code, count, first_log = cached_get(URL_HISTORY, fetch_list_head)
+        if status_code == 200:
             # Verify it's a list
-            if not isinstance(data, list):
-                results.log_fail("GET /history", f"Expected list, got {type(data)}")
+            if count is None:
+                results.log_fail("GET /history", "Expected a JSON array")
                 return False
             
-            results.log_pass(f"GET /history - returned {len(data)} logs")
+            results.log_pass(f"GET /history - returned {count} logs")
             
             # If we have logs, verify structure
-            if len(data) > 0:
-                first_log = data[0]
-                required_fields = ['date', 'tasks', 'day_number', 'is_completed']
-                for field in required_fields:
-                    if field not in first_log:
-                        results.log_fail("GET /history structure", f"Missing field: {field}")
-                        return False
-                
-                # Verify photo_base64 is excluded
-                if 'photo_base64' in first_log:
-                    results.log_fail("GET /history structure", "photo_base64 should be excluded")
+            if first_log is not None:
+                # Required fields present, photo_base64 excluded
+                problem = validate_history_item(first_log)
+                if problem:
+                    results.log_fail("GET /history structure", problem)
                     return False
                 
                 results.log_pass("GET /history - structure correct")
             
             return True
         else:
-            results.log_fail("GET /history", f"Status code: {response.status_code}")
+            results.log_fail("GET /history", f"Status code: {status_code}")
             return False
     except Exception as e:
         results.log_fail("GET /history", f"Error: {str(e)}")
         return False
 
+@parallel_safe
 def test_photos_endpoint():
     """Test GET /api/photos endpoint"""
     try:
-        response = requests.get(f"{BASE_URL}/photos", timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            
+        status_code, count, first_photo = cached_get(URL_PHOTOS, fetch_list_head)
+        if status_code == 200:
             # Verify it's a list
-            if not isinstance(data, list):
-                results.log_fail("GET /photos", f"Expected list, got {type(data)}")
+            if count is None:
+                results.log_fail("GET /photos", "Expected a JSON array")
                 return False
             
-            results.log_pass(f"GET /photos - returned {len(data)} photos")
+            results.log_pass(f"GET /photos - returned {count} photos")
             
             # If we have photos, verify structure
-            if len(data) > 0:
-                first_photo = data[0]
-                required_fields = ['day_number', 'photo_base64', 'date']
-                for field in required_fields:
-                    if field not in first_photo:
-                        results.log_fail("GET /photos structure", f"Missing field: {field}")
-                        return False
-                
-                # Verify photo_base64 is present and not None
-                if first_photo.get('photo_base64') is None:
-                    results.log_fail("GET /photos structure", "photo_base64 should not be None")
+            if first_photo is not None:
+                # Required fields present, photo_base64 not None
+                problem = validate_photo_item(first_photo)
+                if problem:
+                    results.log_fail("GET /photos structure", problem)
                     return False
                 
                 results.log_pass("GET /photos - structure correct")
             
             return True
         else:
-            results.log_fail("GET /photos", f"Status code: {response.status_code}")
+            results.log_fail("GET /photos", f"Status code: {status_code}")
             return False
     except Exception as e:
         results.log_fail("GET /photos", f"Error: {str(e)}")
         return False
 
+@parallel_safe
+def test_photo_by_date_endpoint():
+    """Test GET /api/photos/{date} for today's uploaded photo and a date without one"""
+    try:
+        # Today's photo only exists between the upload and a reset
+        if _DATA_SEEDED:
+            status_code, today = get_today_cached()
+            if status_code != 200:
+                results.log_fail("GET /photos/{date}", f"GET /today status code: {status_code}")
+                return False
+            
+            status_code, photo = cached_get(f"{URL_PHOTOS}/{today['date']}", fetch_json)
+            if status_code != 200:
+                results.log_fail("GET /photos/{date}", f"Status code: {status_code}")
+                return False
+            
+            problem = validate_photo_item(photo)
+            if not problem and photo["date"] != today["date"]:
+                problem = f"Expected date {today['date']}, got {photo['date']}"
+            if problem:
+                results.log_fail("GET /photos/{date} structure", problem)
+                return False
+            
+            results.log_pass("GET /photos/{date} - today's photo")
+        
+        status_code, = cached_get(URL_PHOTO_MISSING)
+        if status_code != 404:
+            results.log_fail("GET /photos/{date} missing", f"Expected 404, got {status_code}")
+            return False
+        
+        results.log_pass("GET /photos/{date} - 404 without a photo")
+        return True
+    except Exception as e:
+        results.log_fail("GET /photos/{date}", f"Error: {str(e)}")
+        return False
+
+# Each is outside server.py's skip >= 0, 1 <= limit <= MAX_PAGE_SIZE (365)
+OUT_OF_BOUNDS_PAGES = ("limit=0", "limit=366", "skip=-1")
+
+@parallel_safe
+def test_pagination_params():
+    """Test skip/limit on GET /api/history and /api/photos, including the 422 bounds"""
+    try:
+        for url in (URL_HISTORY, URL_PHOTOS):
+            name = f"GET {url.removeprefix(BASE_URL)} pagination"
+            status_code, count, _ = cached_get(f"{url}?limit=1", fetch_list_head)
+            if status_code != 200:
+                results.log_fail(name, f"limit=1 status code: {status_code}")
+                return False
+            if count is None:
+                results.log_fail(name, "limit=1 - Expected a JSON array")
+                return False
+            if count > 1:
+                results.log_fail(name, f"limit=1 returned {count} items")
+                return False
+            
+            wrong = {query: status for query in OUT_OF_BOUNDS_PAGES
+                     if (status := cached_get(f"{url}?{query}")[0]) != 422}
+            if wrong:
+                results.log_fail(name, f"Expected 422, got {wrong}")
+                return False
+            
+            results.log_pass(name)
+        return True
+    except Exception as e:
+        results.log_fail("GET pagination", f"Error: {str(e)}")
+        return False
+
+@parallel_safe
 def test_calendar_ui_support():
     """Test calendar date generation and status logic support"""
     try:
-        # Get history data that calendar uses
-        response = requests.get(f"{BASE_URL}/history", timeout=10)
-        if response.status_code != 200:
-            results.log_fail("Calendar UI Support - History", f"Status code: {response.status_code}")
+        # Get history data that calendar uses (first log only, from the shared cached read)
+        status_code, _, log = cached_get(URL_HISTORY, fetch_list_head)
+        if status_code != 200:
+            results.log_fail("Calendar UI Support - History", f"Status code: {status_code}")
             return False
         
-        history_data = response.json()
-        
         # Verify calendar can determine day status from history data
-        if len(history_data) > 0:
-            log = history_data[0]
-            
+        if log is not None:
             # Calendar needs these fields to determine status
-            status_fields = ['is_completed', 'tasks', 'date']
-            for field in status_fields:
-                if field not in log:
-                    results.log_fail("Calendar UI Support - Status Logic", f"Missing field for status: {field}")
-                    return False
+            problem = validate_calendar_log(log)
+            if problem:
+                results.log_fail("Calendar UI Support - Status Logic", f"{problem} (needed for status)")
+                return False
             
             # Calendar needs to check all tasks completion
             if not isinstance(log['tasks'], dict):
@@ -387,33 +862,23 @@ def test_calendar_ui_support():
         results.log_fail("Calendar UI Support", f"Error: {str(e)}")
         return False
 
+@parallel_safe
 def test_modal_content_support():
     """Test modal content rendering support"""
     try:
-        # Get history data that modal uses
-        response = requests.get(f"{BASE_URL}/history", timeout=10)
-        if response.status_code != 200:
-            results.log_fail("Modal Content Support - History", f"Status code: {response.status_code}")
+        # Get history data that modal uses (first log only, from the shared cached read)
+        status_code, _, log = cached_get(URL_HISTORY, fetch_list_head)
+        if status_code != 200:
+            results.log_fail("Modal Content Support - History", f"Status code: {status_code}")
             return False
         
-        history_data = response.json()
-        
-        if len(history_data) > 0:
-            log = history_data[0]
-            
-            # Modal needs these fields for content rendering
-            modal_fields = ['date', 'tasks', 'is_completed', 'day_number']
-            for field in modal_fields:
-                if field not in log:
-                    results.log_fail("Modal Content Support", f"Missing field for modal: {field}")
-                    return False
-            
-            # Modal needs individual task status for rendering
-            expected_tasks = ['diet', 'workout_1', 'workout_2', 'water', 'reading', 'no_alcohol', 'photo_logged']
-            for task in expected_tasks:
-                if task not in log['tasks']:
-                    results.log_fail("Modal Content Support", f"Missing task for modal: {task}")
-                    return False
+        if log is not None:
+            # Modal needs the log fields plus individual task status for rendering,
+            # the same shape as GET /today
+            problem = validate_today(log)
+            if problem:
+                results.log_fail("Modal Content Support", f"{problem} (needed for modal)")
+                return False
             
             results.log_pass("Modal Content Support")
         else:
@@ -426,183 +891,87 @@ def test_modal_content_support():
 
 def test_challenge_management_api():
     """Test the complete Challenge Management API workflow"""
+    # Three mutations, each verified from one GET of the list afterwards; the
+    # defaults check rides on the first of those reads
     print("🧪 Testing Challenge Management API")
     print("=" * 50)
     
-    # Test 1: GET /api/challenges (should return default challenges)
-    print("\n1️⃣ Testing GET /api/challenges (default challenges)")
-    try:
-        response = requests.get(f"{BASE_URL}/challenges", timeout=10)
-        if response.status_code == 200:
-            challenges = response.json()
-            results.log_pass(f"GET /challenges - Found {len(challenges)} default challenges")
-            
-            # Verify default challenges structure
-            expected_defaults = ["diet", "workout_1", "workout_2", "water", "reading", "no_alcohol"]
-            found_ids = [c.get("id") for c in challenges]
-            
-            missing_defaults = []
-            for expected_id in expected_defaults:
-                if expected_id not in found_ids:
-                    missing_defaults.append(expected_id)
-            
-            if missing_defaults:
-                results.log_fail("GET /challenges - Default challenges", f"Missing: {missing_defaults}")
-                return False
-        else:
-            results.log_fail("GET /challenges", f"Status code: {response.status_code}")
-            return False
-    except Exception as e:
-        results.log_fail("GET /challenges", f"Error: {str(e)}")
+    # Test 1: POST /api/challenges (create new challenge)
+    print("\n1️⃣ Testing POST /api/challenges (create new challenge)")
+    if api_call("POST", URL_CHALLENGES, "POST /challenges", body=NEW_CHALLENGE_BODY) is None:
         return False
+    results.log_pass("POST /challenges - Create new challenge")
     
-    # Test 2: POST /api/challenges (create new challenge)
-    print("\n2️⃣ Testing POST /api/challenges (create new challenge)")
-    new_challenge = {
-        "id": "run_1_mile",
-        "label": "Run 1 Mile", 
-        "sub": "Daily cardio challenge",
-        "icon": "Activity",
-        "is_active": True
-    }
+    # Test 2: GET /api/challenges - defaults still there and new challenge appears
+    print("\n2️⃣ Testing GET /api/challenges (default challenges + new challenge)")
+    challenges = api_call("GET", URL_CHALLENGES, "GET /challenges", cache=True)
+    if challenges is None:
+        return False
+    results.log_pass(f"GET /challenges - Found {len(challenges)} challenges")
     
-    try:
-        response = requests.post(f"{BASE_URL}/challenges", json=new_challenge, timeout=10)
-        if response.status_code == 200:
-            results.log_pass("POST /challenges - Create new challenge")
-        else:
-            results.log_fail("POST /challenges", f"Status code: {response.status_code}, Response: {response.text}")
-            return False
-    except Exception as e:
-        results.log_fail("POST /challenges", f"Error: {str(e)}")
+    # Verify default challenges structure
+    expected_defaults = frozenset(("diet", "workout_1", "workout_2", "water", "reading", "no_alcohol"))
+    found_ids = {c.get("id") for c in challenges}
+    
+    missing_defaults = expected_defaults - found_ids
+    if missing_defaults:
+        results.log_fail("GET /challenges - Default challenges", f"Missing: {sorted(missing_defaults)}")
         return False
     
-    # Test 3: Verify new challenge appears in GET /api/challenges
-    print("\n3️⃣ Testing GET /api/challenges (verify new challenge appears)")
-    try:
-        response = requests.get(f"{BASE_URL}/challenges", timeout=10)
-        if response.status_code == 200:
-            challenges = response.json()
-            found_new_challenge = any(c.get("id") == "run_1_mile" for c in challenges)
-            
-            if found_new_challenge:
-                results.log_pass("GET /challenges - New challenge appears")
-            else:
-                results.log_fail("GET /challenges - New challenge", "New challenge 'run_1_mile' not found")
-                return False
-        else:
-            results.log_fail("GET /challenges verification", f"Status code: {response.status_code}")
-            return False
-    except Exception as e:
-        results.log_fail("GET /challenges verification", f"Error: {str(e)}")
+    if "run_1_mile" in found_ids:
+        results.log_pass("GET /challenges - New challenge appears")
+    else:
+        results.log_fail("GET /challenges - New challenge", "New challenge 'run_1_mile' not found")
         return False
     
-    # Test 4: GET /api/today and verify new challenge is in tasks dictionary
-    print("\n4️⃣ Testing GET /api/today (verify new challenge in tasks)")
-    try:
-        response = requests.get(f"{BASE_URL}/today", timeout=10)
-        if response.status_code == 200:
-            today_log = response.json()
-            tasks = today_log.get("tasks", {})
-            
-            if "run_1_mile" in tasks:
-                results.log_pass("GET /today - New challenge in tasks")
-            else:
-                results.log_fail("GET /today - New challenge", f"New challenge not in tasks. Available: {list(tasks.keys())}")
-                return False
-        else:
-            results.log_fail("GET /today verification", f"Status code: {response.status_code}")
-            return False
-    except Exception as e:
-        results.log_fail("GET /today verification", f"Error: {str(e)}")
+    # Test 3: GET /api/today and verify new challenge is in tasks dictionary
+    print("\n3️⃣ Testing GET /api/today (verify new challenge in tasks)")
+    today_log = api_call("GET", URL_TODAY, "GET /today verification", cache=True)
+    if today_log is None:
         return False
     
-    # Test 5: PUT /api/challenges/{id} to toggle is_active=false
-    print("\n5️⃣ Testing PUT /api/challenges/run_1_mile (set is_active=false)")
-    try:
-        update_data = {"is_active": False}
-        response = requests.put(f"{BASE_URL}/challenges/run_1_mile", json=update_data, timeout=10)
-        if response.status_code == 200:
-            results.log_pass("PUT /challenges - Toggle inactive")
-        else:
-            results.log_fail("PUT /challenges", f"Status code: {response.status_code}, Response: {response.text}")
-            return False
-    except Exception as e:
-        results.log_fail("PUT /challenges", f"Error: {str(e)}")
+    tasks = today_log.get("tasks", {})
+    if "run_1_mile" in tasks:
+        results.log_pass("GET /today - New challenge in tasks")
+    else:
+        results.log_fail("GET /today - New challenge", f"New challenge not in tasks. Available: {list(tasks.keys())}")
         return False
     
-    # Test 6: Verify GET /api/challenges shows it as inactive
-    print("\n6️⃣ Testing GET /api/challenges (verify challenge is inactive)")
-    try:
-        response = requests.get(f"{BASE_URL}/challenges", timeout=10)
-        if response.status_code == 200:
-            challenges = response.json()
-            inactive_challenge = next((c for c in challenges if c.get("id") == "run_1_mile"), None)
-            
-            if inactive_challenge and inactive_challenge.get("is_active") == False:
-                results.log_pass("GET /challenges - Challenge marked inactive")
-            else:
-                results.log_fail("GET /challenges - Inactive status", "Challenge not marked as inactive")
-                return False
-        else:
-            results.log_fail("GET /challenges inactive check", f"Status code: {response.status_code}")
-            return False
-    except Exception as e:
-        results.log_fail("GET /challenges inactive check", f"Error: {str(e)}")
+    # Test 4: PUT /api/challenges/{id} to toggle is_active=false
+    print("\n4️⃣ Testing PUT /api/challenges/run_1_mile (set is_active=false)")
+    if api_call("PUT", URL_TEST_CHALLENGE, "PUT /challenges", body=INACTIVE_BODY) is None:
         return False
+    results.log_pass("PUT /challenges - Toggle inactive")
     
-    # Test 7: GET /api/today again - verify how it handles inactive tasks
-    print("\n7️⃣ Testing GET /api/today (verify inactive task handling)")
-    try:
-        response = requests.get(f"{BASE_URL}/today", timeout=10)
-        if response.status_code == 200:
-            today_log = response.json()
-            tasks = today_log.get("tasks", {})
-            
-            # Check if inactive challenge is still in tasks or removed
-            if "run_1_mile" in tasks:
-                results.log_pass("GET /today - Inactive task handling (kept in DB)")
-                print("   ℹ️  Note: Backend keeps inactive tasks in DB, frontend should filter them")
-            else:
-                results.log_pass("GET /today - Inactive task handling (removed from tasks)")
-        else:
-            results.log_fail("GET /today inactive handling", f"Status code: {response.status_code}")
-            return False
-    except Exception as e:
-        results.log_fail("GET /today inactive handling", f"Error: {str(e)}")
+    # Test 5: Verify GET /api/challenges shows it as inactive
+    print("\n5️⃣ Testing GET /api/challenges (verify challenge is inactive)")
+    challenges = api_call("GET", URL_CHALLENGES, "GET /challenges inactive check", cache=True)
+    if challenges is None:
         return False
     
-    # Test 8: DELETE /api/challenges/{id}
-    print("\n8️⃣ Testing DELETE /api/challenges/run_1_mile")
-    try:
-        response = requests.delete(f"{BASE_URL}/challenges/run_1_mile", timeout=10)
-        if response.status_code == 200:
-            results.log_pass("DELETE /challenges - Challenge deleted")
-        else:
-            results.log_fail("DELETE /challenges", f"Status code: {response.status_code}, Response: {response.text}")
-            return False
-    except Exception as e:
-        results.log_fail("DELETE /challenges", f"Error: {str(e)}")
+    inactive_challenge = next((c for c in challenges if c.get("id") == "run_1_mile"), None)
+    if inactive_challenge and inactive_challenge.get("is_active") == False:
+        results.log_pass("GET /challenges - Challenge marked inactive")
+    else:
+        results.log_fail("GET /challenges - Inactive status", "Challenge not marked as inactive")
         return False
     
-    # Test 9: Verify it's gone from GET /api/challenges
-    print("\n9️⃣ Testing GET /api/challenges (verify challenge is deleted)")
-    try:
-        response = requests.get(f"{BASE_URL}/challenges", timeout=10)
-        if response.status_code == 200:
-            challenges = response.json()
-            deleted_challenge = any(c.get("id") == "run_1_mile" for c in challenges)
-            
-            if not deleted_challenge:
-                results.log_pass("GET /challenges - Challenge successfully deleted")
-            else:
-                results.log_fail("GET /challenges - Delete verification", "Challenge still exists after deletion")
-                return False
-        else:
-            results.log_fail("GET /challenges delete verification", f"Status code: {response.status_code}")
-            return False
-    except Exception as e:
-        results.log_fail("GET /challenges delete verification", f"Error: {str(e)}")
+    # Test 6: DELETE /api/challenges/{id}
+    print("\n6️⃣ Testing DELETE /api/challenges/run_1_mile")
+    if api_call("DELETE", URL_TEST_CHALLENGE, "DELETE /challenges") is None:
+        return False
+    results.log_pass("DELETE /challenges - Challenge deleted")
+    
+    # Test 7: Verify it's gone from GET /api/challenges
+    print("\n7️⃣ Testing GET /api/challenges (verify challenge is deleted)")
+    challenges = api_call("GET", URL_CHALLENGES, "GET /challenges delete verification", cache=True)
+    if challenges is None:
+        return False
+    
+    if not any(c.get("id") == "run_1_mile" for c in challenges):
+        results.log_pass("GET /challenges - Challenge successfully deleted")
+    else:
+        results.log_fail("GET /challenges - Delete verification", "Challenge still exists after deletion")
         return False
     
     print("\n🎉 All Challenge Management API tests completed successfully!")
@@ -625,38 +994,52 @@ def test_ui_functionality_support():
         print("❌ Failed to initialize day - aborting tests")
         return False
     
-    # Add some task data to ensure we have content to test
-    test_toggle_tasks()
-    test_complete_all_tasks()  # This includes photo upload
+    # Add some task data to ensure we have content to test (skipped when an
+    # earlier run in this process already seeded it, as in run_visualization_tests)
+    if not _DATA_SEEDED:
+        test_toggle_tasks()
+        test_complete_all_tasks()  # This includes photo upload
     
     print("\n📱 Testing UI Backend Support:")
     
-    # 1. Verify GET /api/history is being called correctly
-    print("\n1️⃣ Testing GET /api/history API call support...")
-    if not test_history_endpoint():
+    # 1.-3. History call, calendar date/status logic and modal content support
+    # only read /api/history, so they run concurrently like the visualization checks
+    print("\n1️⃣-3️⃣ Testing history API, calendar logic and modal content support...")
+    prefetch()
+    history_ok, calendar_ok, modal_ok = gather(
+        test_history_endpoint, test_calendar_ui_support, test_modal_content_support
+    )
+    if not history_ok:
         print("❌ History endpoint test failed")
         return False
     
-    # 2. Verify calendar date generation and status logic support
-    print("\n2️⃣ Testing calendar date generation and status logic support...")
-    if not test_calendar_ui_support():
+    if not calendar_ok:
         print("❌ Calendar UI support test failed")
         return False
     
-    # 3. Check modal content rendering support (data availability)
-    print("\n3️⃣ Testing modal content rendering support...")
-    if not test_modal_content_support():
+    if not modal_ok:
         print("❌ Modal content support test failed")
         return False
     
-    # 4. Verify today endpoint still works (for current day data)
+    # 4. Current day data, checked against the /today response already cached
+    # by step 1 / prefetch() rather than another GET
     print("\n4️⃣ Testing current day data support...")
-    if not test_get_today_initial():
+    problem = "no /today response cached" if _TODAY_CACHE["data"] is None else validate_today(_TODAY_CACHE["data"])
+    if problem:
+        results.log_fail("Current day data support", problem)
         print("❌ Today endpoint test failed")
         return False
+    results.log_pass("Current day data support")
     
     return True
 
+# Read-only tests in definition order; the stateful toggle -> complete -> reset
+# sequence stays serial in run_all_tests
+PARALLEL_TESTS = tuple(
+    test for name, test in list(globals().items())
+    if name.startswith("test_") and getattr(test, "parallel_safe", False)
+)
+
 def run_visualization_tests():
     """Run tests for the new visualization endpoints"""
     print("🚀 Testing New Visualization Endpoints")
@@ -675,25 +1058,33 @@ def run_visualization_tests():
         return False
     
     # Add some task data and photo to ensure we have content to test
-    test_toggle_tasks()
-    test_complete_all_tasks()  # This includes photo upload
+    if not _DATA_SEEDED:
+        test_toggle_tasks()
+        test_complete_all_tasks()  # This includes photo upload
     
     # Now test the visualization endpoints
     print("\n📊 Testing Visualization Endpoints:")
     
-    # 1. Test GET /api/history
-    if not test_history_endpoint():
+    # 1.-4. GET /api/history, /api/photos, /api/photos/{date} and the
+    # skip/limit pages are read-only and independent
+    prefetch()
+    history_ok, photos_ok, photo_ok, pages_ok = gather(
+        test_history_endpoint, test_photos_endpoint, test_photo_by_date_endpoint, test_pagination_params
+    )
+    if not history_ok:
         print("❌ History endpoint test failed")
         return False
     
-    # 2. Test GET /api/photos  
-    if not test_photos_endpoint():
+    if not photos_ok:
         print("❌ Photos endpoint test failed")
         return False
     
-    # 3. Verify GET /api/today still works
-    if not test_get_today_initial():
-        print("❌ Today endpoint test failed")
+    if not photo_ok:
+        print("❌ Photo by date endpoint test failed")
+        return False
+    
+    if not pages_ok:
+        print("❌ Pagination test failed")
         return False
     
     return True
@@ -721,7 +1112,7 @@ def run_all_tests():
         return False
     
     # 3. Verify the log is updated
-    if not test_verify_log_updated():
+    if not test_verify_log_updated(fetch_today("Verify log updated")):
         print("❌ Failed to verify log updates - aborting tests")
         return False
     
@@ -741,23 +1132,63 @@ def run_all_tests():
         print("❌ Failed to complete day - aborting tests")
         return False
     
-    # 7. Verify next day
-    if not test_verify_next_day():
+    # 7. Read-only checks against the completed day, as one concurrent batch.
+    # Ahead of step 8, which fails on the same calendar date and ends the run
+    print("\n📊 Running read-only checks in parallel:")
+    prefetch()
+    if not all(gather(*PARALLEL_TESTS)):
+        print("❌ Read-only checks failed - aborting tests")
+        return False
+    
+    # 8. Verify next day
+    if not test_verify_next_day(fetch_today("Verify next day")):
         print("❌ Failed to verify next day - aborting tests")
         return False
     
-    # 8. Reset and verify back to Day 1
+    # 9. Reset and verify back to Day 1
     if not test_reset_progress():
         print("❌ Failed to reset progress - aborting tests")
         return False
     
     return True
 
+class SuiteDeadline(BaseException):
+    """Raised by the SIGALRM handler once the whole run is past SUITE_DEADLINE.
+
+    Not an OSError/Exception: TimeoutError is socket.timeout, which urllib3
+    treats as a read timeout and retries, and the tests' except Exception
+    blocks would log it as one more failure and carry on.
+    """
+
+def _deadline_exceeded(signum, frame):
+    raise SuiteDeadline(f"Suite exceeded its {SUITE_DEADLINE}s deadline")
+
+def warm_up_connection():
+    """Open the pooled TLS connection before any test runs"""
+    # Keeps the handshake out of whichever test happens to go first
+    try:
+        SESSION.get(URL_HEALTH, timeout=TIMEOUT)
+    except requests.RequestException:
+        pass  # test_health_check reports connectivity problems properly
+
 if __name__ == "__main__":
-    results = TestResults()
-    
-    # Run Challenge Management API tests as requested in review
-    success = test_challenge_management_api()
+    # Piped (as in CI) stdout is block-buffered and BufferedStreamHandler
+    # flushes it every few records; a terminal keeps line buffering so an
+    # interactive run shows each line as it happens
+    logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[BufferedStreamHandler(sys.stdout)])
+    if hasattr(signal, "SIGALRM"):  # POSIX only
+        signal.signal(signal.SIGALRM, _deadline_exceeded)
+        signal.alarm(SUITE_DEADLINE)
+    try:
+        warm_up_connection()
+        
+        # Run Challenge Management API tests as requested in review
+        success = test_challenge_management_api()
+    except SuiteDeadline as e:
+        results.log_fail("Suite deadline", str(e))
+    finally:
+        if hasattr(signal, "SIGALRM"):
+            signal.alarm(0)
     
     # Print final summary
     all_passed = results.summary()
@@ -0,0 +1,51 @@
+"""
+pytest fixtures for backend_test.py.
+
+The script still runs standalone; under pytest the pooled session is shared
+across the whole run, and a test fails if it (or its fixtures) logged any
+failure through backend_test.results.
+"""
+
+import pytest
+
+import backend_test
+
+_failed_before = pytest.StashKey[int]()
+
+
+def pytest_configure(config):
+    # The test functions double as script steps and return their results
+    config.addinivalue_line("filterwarnings", "ignore::pytest.PytestReturnNotNoneWarning")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    # Counted before fixtures run, since fetch_today() logs its own failures
+    item.stash[_failed_before] = backend_test.results.failed
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    # Checked in the call phase so a logged failure fails the test itself,
+    # rather than passing it and erroring at teardown
+    yield
+    results = backend_test.results
+    failed_before = item.stash[_failed_before]
+    if results.failed != failed_before:
+        errors = "; ".join(f"{name}: {error}" for name, error in results.errors[failed_before:])
+        pytest.fail(errors, pytrace=False)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def http():
+    """The script's pooled session, warmed once and closed at the end of the run"""
+    session = backend_test.get_session()
+    backend_test.warm_up_connection()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def today(http):
+    """Current GET /today, served from the script's cache until a mutating call"""
+    return backend_test.fetch_today()
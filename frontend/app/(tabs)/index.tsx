@@ -83,6 +83,15 @@ export default function TodayScreen() {
       const challengesData = await challengesRes.json();
       const logData = await logRes.json();
 
+      // The image is stored apart from the log; fetch it only when there is one
+      if (logData.has_photo) {
+        const photoRes = await fetch(`${API_URL}/photos/${logData.date}`);
+        if (photoRes.ok) {
+          const photoData = await photoRes.json();
+          logData.photo_base64 = photoData.photo_base64;
+        }
+      }
+
       setChallenges(challengesData.filter((c: any) => c.is_active));
       setLog(logData);
       setDayNumber(logData.day_number);
@@ -144,19 +153,32 @@ export default function TodayScreen() {
     });
 
     if (!result.canceled && result.assets && result.assets[0].base64) {
-      const base64Img = result.assets[0].base64;
+      const asset = result.assets[0];
+      const base64Img = asset.base64;
       
       setLog({ 
         ...log, 
-        photo_base64: base64Img, 
+        photo_base64: base64Img,
+        has_photo: true,
         tasks: { ...log.tasks, photo_logged: true } 
       });
 
       try {
+        // Send the raw file as multipart; the backend does the base64 encoding
+        const form = new FormData();
+        if (Platform.OS === 'web') {
+          const blob = await (await fetch(asset.uri)).blob();
+          form.append('file', blob, 'photo.jpg');
+        } else {
+          form.append('file', {
+            uri: asset.uri,
+            name: 'photo.jpg',
+            type: asset.mimeType || 'image/jpeg',
+          } as any);
+        }
         await fetch(`${API_URL}/log/photo`, {
           method: 'POST',
-          headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify({ image_base64: base64Img }),
+          body: form,
         });
       } catch (error) {
         console.error("Upload error:", error);